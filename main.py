@@ -21,25 +21,47 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import atexit
+import importlib
+import inspect
 import logging
+import os
+import re
+import shlex
+import signal
 import subprocess
 import sys
 import textwrap
+import threading
 from enum import Enum
-from typing import Callable, Tuple, Union, List
+from functools import lru_cache, wraps
+from types import ModuleType
+from typing import TYPE_CHECKING, Callable, Dict, Tuple, Union, List
 
 # Import exception handling
 try:
-    import sh
-    from fabric import Connection
     from loguru import logger as loguru_logger
-    from plumbum import local
 except ImportError:
     subprocess.run("sh init.sh", shell=True, check=True)
-    import sh
-    from fabric import Connection
     from loguru import logger as loguru_logger
-    from plumbum import local
+
+if TYPE_CHECKING:
+    from fabric import Connection
+
+
+def _import_backend(name: str) -> ModuleType:
+    """
+    Import a command execution library on first use, installing the requirements if it is missing.
+    sh, plumbum and fabric are loaded lazily so the default subprocess path does not import them.
+
+    :param name: str: The module name ('sh', 'plumbum' or 'fabric').
+    :return: ModuleType: The imported module.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        subprocess.run("sh init.sh", shell=True, check=True)
+        return importlib.import_module(name)
 
 
 class LibsEnum(Enum):
@@ -48,6 +70,8 @@ class LibsEnum(Enum):
     PLUMBUM = 'plumbum'
     SH = 'sh'
     FABRIC = 'fabric'
+    FAST = 'fast'  # posix_spawn + pipe, without subprocess bookkeeping
+    PERSISTENT_BASH = 'persistent_bash'  # One long-lived bash for all commands; shell state carries over
 
 
 class Config:
@@ -66,39 +90,87 @@ class Config:
     EXIT_CODE_LOGGING_LEVEL = "DEBUG"
     ADD_NEWLINE = True  # Option to add newline after prefixes
     NUM_TABS = 1  # Number of tabs to add if text consists of newlines
+    LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>"
+    LOG_FORMAT_PLAIN = "{level: <8} | {message}"  # Used when stderr is not a terminal
+    ASYNC_LOGGING = True  # Format and write log records on a background thread; re-apply with set_logging_library
+    TRACE_ENABLED = True  # Trace/result logs; also compiled out entirely under `python -O`
+    LOGGING_ENABLED = True  # Set to False to skip all command logging
+    SEPARATE_ERROR_LOG = False  # Log failures as their own record instead of inside the command's record
+    DECODE_STDOUT = True  # Set to False to skip decoding output when only exit codes matter
 
 
 logger = None
+_LOGGING_CONFIGURED_AS = None  # Name of the logging library currently set up
+_LOG_CONFIGURED = False  # Whether the loguru sink has been installed
+
+
+def _configure_loguru(force: bool = False):
+    """
+    Install the loguru stderr sink once; later calls are no-ops unless `force` is set.
+
+    :param force: bool: Replace the installed sink so changed `Config` log settings take effect.
+    """
+    global _LOG_CONFIGURED
+    if _LOG_CONFIGURED and not force:
+        return
+    is_tty = sys.stderr.isatty()
+    loguru_logger.remove()
+    loguru_logger.add(
+        sys.stderr,
+        level=Config.LOGGING_LEVEL,
+        format=Config.LOG_FORMAT if is_tty else Config.LOG_FORMAT_PLAIN,
+        colorize=is_tty,
+        backtrace=False,
+        diagnose=False,
+        enqueue=Config.ASYNC_LOGGING,
+    )
+    atexit.unregister(loguru_logger.complete)
+    if Config.ASYNC_LOGGING:
+        atexit.register(loguru_logger.complete)  # Flush queued records before exit
+    _LOG_CONFIGURED = True
 
 
 def set_logging_library(library: str):
     """
     Function to switch logging library by monkey-patching.
 
+    Calling it again with 'loguru' re-applies the `Config` log settings (level, format, ASYNC_LOGGING).
+
     :param library: str: The name of the logging library to use ('loguru' or 'logging').
     """
-    global logger
+    global logger, _LOGGING_CONFIGURED_AS
     if library == 'loguru':
         logger = globals()['logger'] = loguru_logger
-        logger.remove()
-        logger.add(
-            sys.stderr,
-            level=Config.LOGGING_LEVEL,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
-        )
+        _configure_loguru(force=True)
     else:
         logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.DEBUG)
         logger = globals()['logger'] = logger
+    _LOGGING_CONFIGURED_AS = library
 
 # for pytests fixing?
-logger = globals()['logger'] = loguru_logger
-logger.remove()
-logger.add(
-    sys.stderr,
-    level=Config.LOGGING_LEVEL,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
-)
+set_logging_library('loguru')
+
+# Level name -> number, resolved once so the per-command level checks stay cheap
+_LEVEL_NO_CACHE = {name: loguru_logger.level(name).no for name in ("TRACE", "DEBUG", "ERROR")}
+
+
+def _log_enabled(level: str) -> bool:
+    """
+    Check whether a record of the given level would be emitted by the current logger.
+
+    :param level: str: The level name (e.g. 'TRACE', 'DEBUG').
+    :return: bool: True if the level passes the logger's threshold.
+    """
+    level_no = _LEVEL_NO_CACHE.get(level)
+    if level_no is None:
+        level_no = _LEVEL_NO_CACHE[level] = loguru_logger.level(level).no
+    if logger is loguru_logger:
+        return logger._core.min_level <= level_no
+    return logger.isEnabledFor(level_no)
+
+# Matches an indented line; only such commands need a dedent pass
+_DEDENT_NEEDED = re.compile(r'\n[ \t]').search
 
 
 def process_command(command: Union[str, list]) -> str:
@@ -108,28 +180,235 @@ def process_command(command: Union[str, list]) -> str:
     :param command: Union[str, list]: The command to process.
     :return: str: A single string command.
     """
-    return textwrap.dedent(' '.join(command) if isinstance(command, list) else command)
+    if isinstance(command, list):
+        command = ' '.join(command)
+    if '\n' not in command or not _DEDENT_NEEDED(command):
+        return command
+    return textwrap.dedent(command)
 
 
-def log_execution(func: Callable) -> Callable:
+# Characters that need /bin/sh to interpret; commands without them can be exec'd directly
+_SHELL_META = b'|&;<>()$`\\"\'*?[#~=%!{}\n'
+# Deleting every other byte leaves something behind only if a metacharacter is present
+_NON_SHELL_META = bytes(i for i in range(256) if i not in _SHELL_META)
+
+
+def _needs_shell(command: str) -> bool:
     """
-    Decorator to log command execution details.
+    Check whether a command uses shell syntax and must be run through /bin/sh.
+
+    :param command: str: The command to check.
+    :return: bool: True if the command contains shell metacharacters.
+    """
+    return bool(command.encode('utf-8', 'surrogatepass').translate(None, _NON_SHELL_META))
+
+
+# Exit codes sh should return instead of raising; exec_cmd does its own error handling
+_ANY_EXIT_CODE = tuple(range(256))
+
+
+@lru_cache(maxsize=256)
+def _sh_cmd(name: str):
+    """
+    Resolve an executable with sh once and reuse the result.
+
+    :param name: str: The program name.
+    :return: sh.Command: The resolved command.
+    """
+    return _import_backend('sh').Command(name)
+
+
+@lru_cache(maxsize=256)
+def _plumbum_cmd(name: str):
+    """
+    Resolve an executable with plumbum once and reuse the result.
+
+    :param name: str: The program name.
+    :return: The resolved plumbum command.
+    """
+    return _import_backend('plumbum').local[name]
+
+
+# Open fabric connections keyed by host, reused across commands
+_FABRIC_POOL: Dict[str, "Connection"] = {}
+
+
+def _get_conn(host: str) -> "Connection":
+    """
+    Return an open fabric connection to the host, reusing a pooled one when possible.
+
+    :param host: str: The remote host to connect to.
+    :return: Connection: An open connection.
     """
+    conn = _FABRIC_POOL.get(host)
+    if conn is None or not conn.is_connected:
+        conn = _FABRIC_POOL[host] = _import_backend('fabric').Connection(host)
+        conn.open()
+    return conn
 
-    def wrapper(command: Union[str, List[str]], *args, **kwargs) -> Tuple[int, str]:
-        command_str = process_command(command)
-        prefix_with_tabs = lambda prefix: prefix + (
-            "\t" * Config.NUM_TABS if Config.ADD_NEWLINE and "\n" in command_str else "")
 
-        logger.log(Config.LOGGING_LEVEL, f"{prefix_with_tabs(Config.COMMAND_TRACING_PREFIX)}{command_str}")
-        exit_code, output = func(command_str, *args, **kwargs)
+def _close_fabric_pool():
+    """
+    Close all pooled fabric connections.
+    """
+    for conn in _FABRIC_POOL.values():
+        conn.close()
+    _FABRIC_POOL.clear()
+
+
+atexit.register(_close_fabric_pool)
+
+_BASH_PROC = None  # Long-lived `bash -s` used by LibsEnum.PERSISTENT_BASH
+_BASH_LOCK = threading.Lock()  # Keeps commands from different threads from interleaving
+# Printed after each command; the random token keeps it from matching real output
+_BASH_DONE_MARKER = f"__BASHER_DONE_{os.urandom(8).hex()}_"
+_BASH_DONE_RE = re.compile(rf"(.*){_BASH_DONE_MARKER}(\d+)__\n?$".encode(), re.DOTALL)
+
+
+def _persistent_bash(command: str) -> Tuple[int, str]:
+    """
+    Run a command in the shared `bash -s` process, starting it on first use.
+
+    :param command: str: The command to run.
+    :return: Tuple[int, str]: A tuple containing the exit code and the command output.
+    """
+    global _BASH_PROC
+    with _BASH_LOCK:
+        if _BASH_PROC is None or _BASH_PROC.poll() is not None:
+            _BASH_PROC = subprocess.Popen(['bash', '-s'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+            # Keep a private copy of the pipe on fd 3 so the sentinel still gets through after a
+            # command redirects the shell's own stdout for good (e.g. `exec >/dev/null`)
+            _BASH_PROC.stdin.write(b"exec 3>&1\n")
+        proc = _BASH_PROC
+        # eval keeps an unbalanced or unfinished command from swallowing the sentinel (a syntax
+        # error is just exit status 2), and </dev/null keeps it from reading the script stream
+        proc.stdin.write(f"eval {shlex.quote(command)} </dev/null\necho {_BASH_DONE_MARKER}$?__ >&3\n".encode())
+
+        chunks = []
+        while line := proc.stdout.readline():
+            match = _BASH_DONE_RE.match(line)
+            if match:
+                chunks.append(match.group(1))
+                return int(match.group(2)), _decode_stdout(b''.join(chunks))
+            chunks.append(line)
+        # The command ended the shell itself (e.g. `exit 3`)
+        return proc.wait(), _decode_stdout(b''.join(chunks))
+
+
+def _close_persistent_bash():
+    """
+    Shut down the shared bash process, if one was started.
+    """
+    if _BASH_PROC is not None and _BASH_PROC.poll() is None:
+        _BASH_PROC.stdin.close()
+        _BASH_PROC.wait()
+
+
+atexit.register(_close_persistent_bash)
+
+
+def _system(command: str) -> int:
+    """
+    Run a command through /bin/sh like `os.system`, but spawned with `os.posix_spawn`.
+
+    Unlike `os.system`, SIGINT and SIGQUIT are not ignored while waiting: Ctrl-C raises
+    KeyboardInterrupt here, after the child has been killed and reaped.
+
+    :param command: str: The command to run.
+    :return: int: The exit code of the command.
+    """
+    pid = os.posix_spawn("/bin/sh", ["sh", "-c", command], os.environ)
+    try:
+        _, status = os.waitpid(pid, 0)
+    except BaseException:
+        # Don't leave the child running (or unreaped) when the wait is interrupted
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        raise
+    return os.waitstatus_to_exitcode(status)
+
+
+def _decode_stdout(data: bytes) -> str:
+    """
+    Decode captured command output in one pass.
+
+    :param data: bytes: The raw output.
+    :return: str: The decoded output, or '' when Config.DECODE_STDOUT is off.
+    """
+    return data.decode('utf-8', 'replace') if data and Config.DECODE_STDOUT else ''
+
+
+def _fast_exec(argv: List[str]) -> Tuple[int, str]:
+    """
+    Run a program with `os.posix_spawnp`, capturing its stdout through a pipe.
+
+    :param argv: List[str]: The program and its arguments.
+    :return: Tuple[int, str]: A tuple containing the exit code and the decoded stdout.
+    :raises OSError: If the program cannot be spawned (e.g. not found on PATH).
+    """
+    r, w = os.pipe()  # Non-inheritable (PEP 446), so other children never hold the write end open
+    try:
+        file_actions = [(os.POSIX_SPAWN_DUP2, w, 1), (os.POSIX_SPAWN_CLOSE, r)]
+        pid = os.posix_spawnp(argv[0], argv, os.environ, file_actions=file_actions)
+    except OSError:
+        os.close(r)
+        raise
+    finally:
+        os.close(w)
+    chunks = []
+    with open(r, 'rb', closefd=True) as pipe:
+        while chunk := pipe.read1(1 << 16):
+            chunks.append(chunk)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status), _decode_stdout(b''.join(chunks))
+
+
+def log_execution(func: Callable) -> Callable:
+    """
+    Decorator to log command execution details.
+
+    The decorated function takes the command as a `command` parameter, which need not come first
+    (methods get `self`, and `exec_cmd_fabric` a host, ahead of it).
+    """
+    command_index = list(inspect.signature(func).parameters).index('command')
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Tuple[int, str]:
+        if 'command' in kwargs:
+            command_str = kwargs['command'] = process_command(kwargs['command'])
+        else:
+            args = (*args[:command_index], process_command(args[command_index]), *args[command_index + 1:])
+            command_str = args[command_index]
+        if not Config.LOGGING_ENABLED:
+            exit_code, output = func(*args, **kwargs)
+            return exit_code, f"{output.strip()} {Config.COMMAND_EXIT_CODE_PREFIX}{exit_code}\n"
+
+        # Read the settings once per call instead of on every use
+        trace_enabled, result_level, error_level = (
+            Config.TRACE_ENABLED, Config.RESULT_LOGGING_LEVEL, Config.ERROR_LOGGING_LEVEL)
+        tabs = "\t" * Config.NUM_TABS if Config.ADD_NEWLINE and "\n" in command_str else ""
+
+        try:
+            exit_code, output = func(*args, **kwargs)
+        except Exception:
+            # No result to report, but keep the failing command visible
+            if _log_enabled(error_level):
+                logger.log(error_level, f"{Config.COMMAND_TRACING_PREFIX}{tabs}{command_str}")
+            raise
         output_with_exit_code = f"{output.strip()} {Config.COMMAND_EXIT_CODE_PREFIX}{exit_code}\n"
 
-        logger.log(Config.RESULT_LOGGING_LEVEL,
-                   f"{prefix_with_tabs(Config.COMMAND_RESULT_PREFIX)}{output_with_exit_code}")
-        if exit_code != 0:
-            logger.log(Config.ERROR_LOGGING_LEVEL,
-                       f"{prefix_with_tabs(Config.COMMAND_ERROR_PREFIX)}Command failed with exit code {exit_code}")
+        # One record per command; a failure is folded into it unless logged separately.
+        # Skip building the message entirely when the sink would filter it out
+        inline_error = exit_code != 0 and not Config.SEPARATE_ERROR_LOG
+        level = error_level if inline_error else result_level
+        if (inline_error or __debug__ and trace_enabled) and _log_enabled(level):
+            message = (f"{Config.COMMAND_TRACING_PREFIX}{tabs}{command_str}\n"
+                       f"{Config.COMMAND_RESULT_PREFIX}{tabs}{output_with_exit_code}")
+            if inline_error:
+                message += f"{Config.COMMAND_ERROR_PREFIX}{tabs}Command failed with exit code {exit_code}"
+            logger.log(level, message)
+        if exit_code != 0 and Config.SEPARATE_ERROR_LOG and _log_enabled(error_level):
+            logger.log(error_level, f"{Config.COMMAND_ERROR_PREFIX}{tabs}Command failed with exit code {exit_code}")
 
         return exit_code, output_with_exit_code
 
@@ -157,28 +436,58 @@ def exec_cmd(command: Union[str, list], trace: Union[bool, Callable, str] = True
     ...
     RuntimeError: Command failed with exit code 127: cmd_not_found
     """
-    command = process_command(command)
+    # `command` has already been normalized by process_command in log_execution
     result = None
 
     if by == LibsEnum.SUBPROCESS:
-        # Use subprocess to execute the command
-        result = subprocess.run(command, shell=True, text=True, capture_output=True)
+        # Use subprocess to execute the command, skipping the extra /bin/sh for plain commands
+        if not _needs_shell(command) and (argv := shlex.split(command)):
+            try:
+                result = subprocess.run(argv, shell=False, capture_output=True)
+            except OSError:
+                pass  # Not an executable (e.g. a shell builtin): let the shell handle it
+        if result is None:
+            result = subprocess.run(command, shell=True, capture_output=True)
+        result = subprocess.CompletedProcess(command, result.returncode, stdout=_decode_stdout(result.stdout))
     elif by == LibsEnum.OS_SYSTEM:
-        # Use os.system to execute the command
-        exit_code = os.system(command)
-        result = subprocess.CompletedProcess(command, exit_code)
+        # Run through /bin/sh like os.system; output goes to the terminal, not captured
+        exit_code = _system(command)
+        result = subprocess.CompletedProcess(command, exit_code, stdout='')
     elif by == LibsEnum.PLUMBUM:
-        # Use plumbum to execute the command
-        cmd = local[command.split()[0]]
-        result = cmd(*command.split()[1:])
+        # Use plumbum to execute the command; a multiline script is fed to one bash via stdin
+        if '\n' in command:
+            exit_code, stdout, _ = (_plumbum_cmd('bash')['-s'] << command).run(retcode=None)
+        else:
+            parts = command.split()
+            exit_code, stdout, _ = _plumbum_cmd(parts[0]).run(parts[1:], retcode=None)
+        result = subprocess.CompletedProcess(command, exit_code, stdout=stdout)
     elif by == LibsEnum.SH:
-        # Use sh to execute the command
-        cmd = sh.Command(command.split()[0])
-        result = cmd(*command.split()[1:])
+        # Use sh to execute the command; a multiline script is fed to one bash via stdin
+        if '\n' in command:
+            cmd = _sh_cmd('bash')('-s', _in=command, _return_cmd=True, _ok_code=_ANY_EXIT_CODE)
+        else:
+            parts = command.split()
+            cmd = _sh_cmd(parts[0])(*parts[1:], _return_cmd=True, _ok_code=_ANY_EXIT_CODE)
+        result = subprocess.CompletedProcess(command, cmd.exit_code, stdout=str(cmd))
     elif by == LibsEnum.FABRIC:
         # Use fabric to execute the command on a remote host
-        conn = Connection('localhost')  # Update with actual host if needed
-        result = conn.run(command, hide=True)
+        conn = _get_conn('localhost')  # Update with actual host if needed
+        run_result = conn.run(command, hide=True, warn=True)
+        result = subprocess.CompletedProcess(command, run_result.return_code, stdout=run_result.stdout)
+    elif by == LibsEnum.FAST:
+        # Spawn the program directly and read its stdout from a pipe
+        argv = None if _needs_shell(command) else shlex.split(command)
+        if not argv:
+            argv = ["sh", "-c", command]
+        try:
+            exit_code, stdout = _fast_exec(argv)
+        except OSError:
+            exit_code, stdout = _fast_exec(["sh", "-c", command])
+        result = subprocess.CompletedProcess(command, exit_code, stdout=stdout)
+    elif by == LibsEnum.PERSISTENT_BASH:
+        # Reuse one bash process instead of forking a new shell per command
+        exit_code, stdout = _persistent_bash(command)
+        result = subprocess.CompletedProcess(command, exit_code, stdout=stdout)
 
     if result is None:
         raise RuntimeError("Failed to execute command")
@@ -196,9 +505,9 @@ class CommandExecutor:
 
     def __init__(self, config: Config):
         self.config = config
-        set_logging_library(self.config.LOGGING_LIBRARY)
+        if _LOGGING_CONFIGURED_AS != self.config.LOGGING_LIBRARY:
+            set_logging_library(self.config.LOGGING_LIBRARY)
 
-    @log_execution
     def exec_cmd(self, command: Union[str, list]) -> Tuple[int, str]:
         """
         Execute a bash command and return the exit code and output.
@@ -227,10 +536,14 @@ class CommandExecutor:
         :return: Tuple[int, str]: A tuple containing the exit code and the command output.
         :raises RuntimeError: If the command exits with a non-zero status.
         """
-        command = process_command(command)
-        cmd = local[command.split()[0]]
-        result = cmd(*command.split()[1:])
-        return result.returncode, str(result)
+        if '\n' in command:
+            exit_code, stdout, _ = (_plumbum_cmd('bash')['-s'] << command).run(retcode=None)
+        else:
+            parts = command.split()
+            exit_code, stdout, _ = _plumbum_cmd(parts[0]).run(parts[1:], retcode=None)
+        if exit_code != 0:
+            raise RuntimeError(f"Command failed with exit code {exit_code}: {command}")
+        return exit_code, stdout
 
     @log_execution
     def exec_cmd_sh(self, command: Union[str, list]) -> Tuple[int, str]:
@@ -241,10 +554,14 @@ class CommandExecutor:
         :return: Tuple[int, str]: A tuple containing the exit code and the command output.
         :raises RuntimeError: If the command exits with a non-zero status.
         """
-        command = process_command(command)
-        cmd = sh.Command(command.split()[0])
-        result = cmd(*command.split()[1:])
-        return result.exit_code, str(result)
+        if '\n' in command:
+            cmd = _sh_cmd('bash')('-s', _in=command, _return_cmd=True, _ok_code=_ANY_EXIT_CODE)
+        else:
+            parts = command.split()
+            cmd = _sh_cmd(parts[0])(*parts[1:], _return_cmd=True, _ok_code=_ANY_EXIT_CODE)
+        if cmd.exit_code != 0:
+            raise RuntimeError(f"Command failed with exit code {cmd.exit_code}: {command}")
+        return cmd.exit_code, str(cmd)
 
     @log_execution
     def exec_cmd_fabric(self, host: str, command: Union[str, list]) -> Tuple[int, str]:
@@ -256,10 +573,10 @@ class CommandExecutor:
         :return: Tuple[int, str]: A tuple containing the exit code and the command output.
         :raises RuntimeError: If the command exits with a non-zero status.
         """
-        command = process_command(command)
-        conn = Connection(host)
-        result = conn.run(command, hide=True)
-        return result.exited, result.stdout
+        result = _get_conn(host).run(command, hide=True, warn=True)
+        if result.return_code != 0:
+            raise RuntimeError(f"Command failed with exit code {result.return_code}: {command}")
+        return result.return_code, result.stdout
 
     def exec_cmd_any(self, command: Union[str, list], by: LibsEnum) -> Tuple[int, str]:
         """
@@ -277,6 +594,21 @@ class CommandExecutor:
         return exec_cmd(command, True, by=by)
 
 
+_DEFAULT_EXECUTOR = None
+
+
+def _get_executor() -> CommandExecutor:
+    """
+    Return the shared executor used by `bash`, creating it on first use.
+
+    :return: CommandExecutor: The module-wide executor instance.
+    """
+    global _DEFAULT_EXECUTOR
+    if _DEFAULT_EXECUTOR is None:
+        _DEFAULT_EXECUTOR = CommandExecutor(Config())
+    return _DEFAULT_EXECUTOR
+
+
 def bash(command: Union[str, list], trace: Union[bool, Callable, str] = True, skip_err: bool = False) -> Tuple[
     int, str]:
     """
@@ -290,7 +622,7 @@ def bash(command: Union[str, list], trace: Union[bool, Callable, str] = True, sk
     >>> bash('echo Hello, World!', True)
     (0, 'Hello, World! EXIT CODE: 0\\n')
     """
-    executor = CommandExecutor(Config())
+    executor = _get_executor()
     return executor.exec_cmd_any(command, Config.COMMAND_LIBRARY)
 
 
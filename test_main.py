@@ -1,33 +1,83 @@
 # test_main.py
 import pytest
-from main import bash, exec_cmd, CommandExecutor, Config, LibsEnum
+from main import bash, exec_cmd, CommandExecutor, Config, LibsEnum, _log_enabled, process_command, _needs_shell
+
+def expected_output(lib):
+    # os.system output goes to the terminal, so only the exit code is reported for it
+    return (0, ' EXIT CODE: 0\n') if lib == LibsEnum.OS_SYSTEM else (0, 'Hello, World! EXIT CODE: 0\n')
 
 @pytest.mark.parametrize("lib", [LibsEnum.SUBPROCESS, LibsEnum.OS_SYSTEM, LibsEnum.PLUMBUM, LibsEnum.SH, LibsEnum.FABRIC])
-def test_exec_cmd(lib):
-    Config.COMMAND_LIBRARY = lib
+def test_exec_cmd(lib, monkeypatch):
+    monkeypatch.setattr(Config, "COMMAND_LIBRARY", lib)
     assert exec_cmd('echo Hello, World!') == (0, 'Hello, World! EXIT CODE: 0\n')
     assert exec_cmd(['echo', 'Hello, World!']) == (0, 'Hello, World! EXIT CODE: 0\n')
 
 @pytest.mark.parametrize("lib", [LibsEnum.SUBPROCESS, LibsEnum.OS_SYSTEM, LibsEnum.PLUMBUM, LibsEnum.SH, LibsEnum.FABRIC])
 def test_exec_cmd_any(lib):
     executor = CommandExecutor(Config())
-    assert executor.exec_cmd_any('echo Hello, World!', lib) == (0, 'Hello, World! EXIT CODE: 0\n')
-    assert executor.exec_cmd_any(['echo', 'Hello, World!'], lib) == (0, 'Hello, World! EXIT CODE: 0\n')
+    assert executor.exec_cmd_any('echo Hello, World!', lib) == expected_output(lib)
+    assert executor.exec_cmd_any(['echo', 'Hello, World!'], lib) == expected_output(lib)
+
+def test_executor_methods():
+    executor = CommandExecutor(Config())
+    assert executor.exec_cmd('echo Hello, World!') == (0, 'Hello, World! EXIT CODE: 0\n')
+    for method in (executor.exec_cmd_plumbum, executor.exec_cmd_sh):
+        assert method(['echo', 'Hello, World!']) == (0, 'Hello, World! EXIT CODE: 0\n')
+        with pytest.raises(RuntimeError):
+            method('false')
 
 @pytest.mark.parametrize("lib", [LibsEnum.SUBPROCESS, LibsEnum.OS_SYSTEM, LibsEnum.PLUMBUM, LibsEnum.SH, LibsEnum.FABRIC])
-def test_bash(lib):
-    Config.COMMAND_LIBRARY = lib
-    assert bash('echo Hello, World!') == (0, 'Hello, World! EXIT CODE: 0\n')
-    assert bash(['echo', 'Hello, World!']) == (0, 'Hello, World! EXIT CODE: 0\n')
+def test_bash(lib, monkeypatch):
+    monkeypatch.setattr(Config, "COMMAND_LIBRARY", lib)
+    assert bash('echo Hello, World!') == expected_output(lib)
+    assert bash(['echo', 'Hello, World!']) == expected_output(lib)
+
+def test_exec_cmd_empty():
+    assert exec_cmd('') == (0, ' EXIT CODE: 0\n')
+    assert exec_cmd('   ') == (0, ' EXIT CODE: 0\n')
+
+def test_exec_cmd_fast():
+    assert exec_cmd('echo Hello, World!', by=LibsEnum.FAST) == (0, 'Hello, World! EXIT CODE: 0\n')
+    assert exec_cmd(['echo', 'Hello'], by=LibsEnum.FAST) == (0, 'Hello EXIT CODE: 0\n')
+    assert exec_cmd('cmd_not_found', skip_err=True, by=LibsEnum.FAST)[0] == 127
+    assert exec_cmd('   ', by=LibsEnum.FAST) == (0, ' EXIT CODE: 0\n')
+
+def test_exec_cmd_persistent_bash():
+    assert exec_cmd('echo Hello, World!', by=LibsEnum.PERSISTENT_BASH) == (0, 'Hello, World! EXIT CODE: 0\n')
+    assert exec_cmd('printf Hello', by=LibsEnum.PERSISTENT_BASH) == (0, 'Hello EXIT CODE: 0\n')
+    assert exec_cmd('false', skip_err=True, by=LibsEnum.PERSISTENT_BASH)[0] == 1
+    assert exec_cmd('exit 3', skip_err=True, by=LibsEnum.PERSISTENT_BASH)[0] == 3
+    assert exec_cmd('echo Hello', by=LibsEnum.PERSISTENT_BASH) == (0, 'Hello EXIT CODE: 0\n')
+    # Neither an unbalanced quote nor a command reading stdin may swallow the sentinel
+    assert exec_cmd('echo "abc', skip_err=True, by=LibsEnum.PERSISTENT_BASH)[0] == 2
+    assert exec_cmd('cat', by=LibsEnum.PERSISTENT_BASH) == (0, ' EXIT CODE: 0\n')
+    assert exec_cmd('echo Hello', by=LibsEnum.PERSISTENT_BASH) == (0, 'Hello EXIT CODE: 0\n')
+    # Nor may a command that redirects the shell's stdout for good
+    assert exec_cmd('exec >/dev/null', by=LibsEnum.PERSISTENT_BASH) == (0, ' EXIT CODE: 0\n')
+    assert exec_cmd('echo Hello', by=LibsEnum.PERSISTENT_BASH) == (0, ' EXIT CODE: 0\n')
+    assert exec_cmd('exit 3', skip_err=True, by=LibsEnum.PERSISTENT_BASH)[0] == 3
+    assert exec_cmd('echo Hello', by=LibsEnum.PERSISTENT_BASH) == (0, 'Hello EXIT CODE: 0\n')
 
 def test_multiline_command():
     command = '''
     echo Line 1
     echo Line 2
     '''
-    expected_output = 'Line 1\nLine 2\n EXIT CODE: 0\n'
-    assert exec_cmd(command) == (0, expected_output)
-    assert bash(command) == (0, expected_output)
+    expected = 'Line 1\nLine 2 EXIT CODE: 0\n'
+    assert exec_cmd(command) == (0, expected)
+    assert bash(command) == (0, expected)
+
+@pytest.mark.parametrize("lib", [LibsEnum.PLUMBUM, LibsEnum.SH])
+def test_multiline_command_stdin(lib):
+    command = '''
+    echo Line 1
+    echo Line 2
+    '''
+    assert exec_cmd(command, by=lib) == (0, 'Line 1\nLine 2 EXIT CODE: 0\n')
+
+def test_logging_disabled(monkeypatch):
+    monkeypatch.setattr(Config, "LOGGING_ENABLED", False)
+    assert exec_cmd('echo Hello, World!') == (0, 'Hello, World! EXIT CODE: 0\n')
 
 def test_command_error():
     with pytest.raises(RuntimeError):
@@ -36,5 +86,20 @@ def test_command_error():
     with pytest.raises(RuntimeError):
         bash('cmd_not_found')
 
+def test_process_command():
+    assert process_command('echo Hello') == 'echo Hello'
+    assert process_command(['echo', 'Hello']) == 'echo Hello'
+    assert process_command('\n    echo Line 1\n    echo Line 2\n    ') == '\necho Line 1\necho Line 2\n'
+
+def test_needs_shell():
+    assert not _needs_shell('echo Hello')
+    assert _needs_shell('echo Hello | cat')
+    assert _needs_shell('echo $HOME')
+    assert _needs_shell('echo Line 1\necho Line 2')
+
+def test_log_enabled():
+    assert _log_enabled(Config.LOGGING_LEVEL)
+    assert _log_enabled(Config.ERROR_LOGGING_LEVEL)
+
 if __name__ == "__main__":
     pytest.main()
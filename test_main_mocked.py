@@ -1,83 +1,144 @@
+"""
+Tests for main.py with the command execution backends mocked out.
+
+Run through the pytest CLI. The assertions here are plain tuple comparisons, so the
+module opts out of assertion rewriting: PYTEST_DONT_REWRITE
+"""
+import subprocess
+from contextlib import contextmanager
+
+import fabric
+import plumbum
 import pytest
-from unittest.mock import patch, MagicMock
-from main import CommandExecutor, exec_cmd, bash, LibsEnum, Config
+import sh
+from invoke.runners import Result
+from unittest.mock import MagicMock
 
+import main
+from main import CommandExecutor, exec_cmd, bash, LibsEnum, Config, _sh_cmd, _plumbum_cmd, _FABRIC_POOL
 
-def mock_command_execution():
-    """Helper function to mock various command execution methods."""
-    mock_subprocess = patch("main.subprocess.run").start()
-    mock_subprocess.return_value = MagicMock(returncode=0, stdout='Hello, World! EXIT CODE: 0\n')
+# The subprocess module main calls run() on, resolved once for the patches below
+_SUBPROCESS = main.subprocess
 
-    mock_os_system = patch("os.system").start()
-    mock_os_system.return_value = 0
+_COMMAND = 'echo Hello, World!'
+_STDOUT = 'Hello, World!\n'  # What the mocked backends print
+_EXPECTED = (0, 'Hello, World! EXIT CODE: 0\n')
+_EXPECTED_NO_OUTPUT = (0, ' EXIT CODE: 0\n')
 
-    mock_plumbum = patch("main.local").start()
-    mock_plumbum.return_value = MagicMock(returncode=0, stdout='Hello, World! EXIT CODE: 0\n')
+# Return values of the mocked backends, shared by all tests since they are only read.
+# Specced so an attribute the real object lacks fails instead of returning a new mock.
+_RET = MagicMock(spec=subprocess.CompletedProcess, returncode=0, stdout=_STDOUT.encode())
+_PLUMBUM_CMD = MagicMock(spec=plumbum.machines.LocalCommand)
+_PLUMBUM_CMD.run.return_value = (0, _STDOUT, '')
+_SH_CMD = MagicMock(spec=sh.Command, return_value=MagicMock(
+    spec=sh.RunningCommand, exit_code=0, **{'__str__.return_value': _STDOUT}))
+_CONN = MagicMock(spec=fabric.Connection)
+_CONN.run.return_value = MagicMock(spec=Result, return_code=0, stdout=_STDOUT)
 
-    mock_sh = patch("main.sh.Command").start()
-    mock_sh.return_value = MagicMock(returncode=0, stdout='Hello, World! EXIT CODE: 0\n')
+# Patch targets resolved once at import: library -> (object, attribute, mock settings)
+_TARGETS = {
+    LibsEnum.SUBPROCESS: (_SUBPROCESS, "run", {"return_value": _RET}),
+    LibsEnum.OS_SYSTEM: (main, "_system", {"return_value": 0}),
+    LibsEnum.PLUMBUM: (plumbum, "local", {"__getitem__.return_value": _PLUMBUM_CMD}),
+    LibsEnum.SH: (sh, "Command", {"return_value": _SH_CMD}),
+    LibsEnum.FABRIC: (fabric, "Connection", {"return_value": _CONN}),
+}
 
-    mock_fabric = patch("main.Connection").start()
-    mock_conn = mock_fabric.return_value
-    mock_conn.run.return_value = MagicMock(returncode=0, stdout='Hello, World! EXIT CODE: 0\n')
 
-    return [mock_subprocess, mock_os_system, mock_plumbum, mock_sh, mock_fabric]
+@pytest.fixture
+def mock_backend(mocker):
+    """Fixture returning a function that mocks the backend of one command execution library."""
+    def patch_backend(lib):
+        # Drop commands and connections cached by earlier tests so the patched resolvers are used
+        _sh_cmd.cache_clear()
+        _plumbum_cmd.cache_clear()
+        _FABRIC_POOL.clear()
 
+        target, attr, settings = _TARGETS[lib]
+        return mocker.patch.object(target, attr, **settings)
 
-@pytest.mark.parametrize("lib",
-                         [LibsEnum.SUBPROCESS, LibsEnum.OS_SYSTEM, LibsEnum.PLUMBUM, LibsEnum.SH, LibsEnum.FABRIC])
-def test_exec_cmd_any(lib):
-    """Test the execution of a command using various libraries."""
-    executor = CommandExecutor(Config())
+    return patch_backend
 
-    mocks = mock_command_execution()
 
-    try:
-        assert executor.exec_cmd_any('echo Hello, World!', lib) == (0, 'Hello, World! EXIT CODE: 0\n')
-    finally:
-        for mock in mocks:
-            mock.stop()
+def expected_output(lib):
+    """Expected result of the mocked `_COMMAND` for the given library."""
+    # os.system output goes to the terminal, so only the exit code is reported for it
+    return _EXPECTED_NO_OUTPUT if lib == LibsEnum.OS_SYSTEM else _EXPECTED
 
 
-@pytest.mark.parametrize("lib",
-                         [LibsEnum.SUBPROCESS, LibsEnum.OS_SYSTEM, LibsEnum.PLUMBUM, LibsEnum.SH, LibsEnum.FABRIC])
-def test_bash(lib):
-    """Test the bash function with different command libraries."""
-    Config.COMMAND_LIBRARY = lib
+@pytest.fixture(scope="session")
+def executor():
+    """A single executor shared by the whole session; exec_cmd_any does not change its state."""
+    return CommandExecutor(Config())
 
-    mocks = mock_command_execution()
 
-    try:
-        assert bash('echo Hello, World!') == (0, 'Hello, World! EXIT CODE: 0\n')
-    finally:
-        for mock in mocks:
-            mock.stop()
+def _via_executor(lib, executor, monkeypatch):
+    return executor.exec_cmd_any(_COMMAND, lib)
+
+
+def _via_bash(lib, executor, monkeypatch):
+    monkeypatch.setattr(Config, "COMMAND_LIBRARY", lib)
+    return bash(_COMMAND)
+
 
+@pytest.mark.parametrize("invoke", [_via_executor, _via_bash])
+def test_exec_cmd_any(invoke, executor, mock_backend, monkeypatch, subtests):
+    """Test the execution of a command using various libraries, via the executor and via bash."""
+    for lib in _TARGETS:
+        with subtests.test(lib=lib):
+            mock_backend(lib)
+            assert invoke(lib, executor, monkeypatch) == expected_output(lib)
 
-def test_multiline_command():
+
+def test_exec_cmd_fabric(executor, mock_backend):
+    """Test that the fabric method passes the host and the command through."""
+    mock_connection = mock_backend(LibsEnum.FABRIC)
+    assert executor.exec_cmd_fabric('example.com', _COMMAND) == _EXPECTED
+    mock_connection.assert_called_once_with('example.com')
+
+
+def test_multiline_command(mock_backend):
     """Test execution of a multiline command."""
     command = '''
     echo Line 1
     echo Line 2
     '''
-    expected_output = 'Line 1\nLine 2\n EXIT CODE: 0\n'
+    expected_output = 'Line 1\nLine 2 EXIT CODE: 0\n'
+    mock_run = mock_backend(LibsEnum.SUBPROCESS)
+    mock_run.return_value = MagicMock(returncode=0, stdout=b'Line 1\nLine 2\n')
+
+    assert exec_cmd(command) == (0, expected_output)
+    mock_run.assert_called_once_with(
+        '\necho Line 1\necho Line 2\n', shell=True, capture_output=True)
+
+
+@contextmanager
+def swapped(obj, **attrs):
+    """Temporarily replace attributes of obj by plain assignment."""
+    old = {name: getattr(obj, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for name, value in old.items():
+            setattr(obj, name, value)
 
-    with patch("main.exec_cmd") as mock_exec_cmd:
-        mock_exec_cmd.return_value = (0, 'Line 1\nLine 2 EXIT CODE: 0\n')
 
-        assert exec_cmd(command) == (0, expected_output)
+def _raise_runtime_error(*args, **kwargs):
+    raise RuntimeError("Command failed")
 
 
-def test_command_error():
-    """Test handling of command execution errors."""
-    with patch("main.exec_cmd", side_effect=RuntimeError("Command failed")) as mock_exec_cmd:
-        with patch("main.bash", side_effect=RuntimeError("Command failed")) as mock_bash:
-            with pytest.raises(RuntimeError):
-                exec_cmd('cmd_not_found')
+def _exit_127(*args, **kwargs):
+    return MagicMock(spec=subprocess.CompletedProcess, returncode=127, stdout=b'')
 
-            with pytest.raises(RuntimeError):
-                bash('cmd_not_found')
 
+@pytest.mark.parametrize("fault", [_raise_runtime_error, _exit_127])
+def test_command_error(fault):
+    """Test that a failing subprocess backend surfaces as RuntimeError from exec_cmd and bash."""
+    with swapped(_SUBPROCESS, run=fault):
+        with pytest.raises(RuntimeError):
+            exec_cmd('cmd_not_found')
 
-if __name__ == "__main__":
-    pytest.main()
+        with pytest.raises(RuntimeError):
+            bash('cmd_not_found')